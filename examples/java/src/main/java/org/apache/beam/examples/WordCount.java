@@ -40,6 +40,7 @@ import org.apache.beam.sdk.values.PCollection;
 import com.google.common.base.Strings;
 
 import java.io.IOException;
+import java.util.regex.Pattern;
 
 /**
  * An example that counts words in Shakespeare and includes Beam best practices.
@@ -101,6 +102,9 @@ public class WordCount {
    * pipeline.
    */
   static class ExtractWordsFn extends DoFn<String, String> {
+    // Compiled once, as String.split would recompile the pattern for every line.
+    private static final Pattern WORD_SPLITTER = Pattern.compile("[^a-zA-Z']+");
+
     private final Aggregator<Long, Long> emptyLines =
         createAggregator("emptyLines", new Sum.SumLongFn());
 
@@ -111,7 +115,7 @@ public class WordCount {
       }
 
       // Split the line into words.
-      String[] words = c.element().split("[^a-zA-Z']+");
+      String[] words = WORD_SPLITTER.split(c.element());
 
       // Output each word encountered into the output PCollection.
       for (String word : words) {
@@ -61,6 +61,7 @@ import java.net.URI;
 import java.net.URISyntaxException;
 import java.util.HashSet;
 import java.util.Set;
+import java.util.regex.Pattern;
 
 /**
  * An example that computes a basic TF-IDF search table for a directory or GCS prefix.
@@ -231,14 +232,15 @@ public class TfIdf {
                 public void processElement(ProcessContext c) {
                   URI uri = c.element().getKey();
                   String line = c.element().getValue();
-                  for (String word : line.split("\\W+")) {
+                  for (String word : WORD_SPLITTER.split(line)) {
+                    String lowerCaseWord = word.toLowerCase();
                     // Log INFO messages when the word “love” is found.
-                    if (word.toLowerCase().equals("love")) {
-                      LOG.info("Found {}", word.toLowerCase());
+                    if (lowerCaseWord.equals("love")) {
+                      LOG.info("Found {}", lowerCaseWord);
                     }
 
                     if (!word.isEmpty()) {
-                      c.output(KV.of(uri, word.toLowerCase()));
+                      c.output(KV.of(uri, lowerCaseWord));
                     }
                   }
                 }
@@ -385,6 +387,10 @@ public class TfIdf {
     // It is suggested that the user specify the class name of the containing class
     // (in this case ComputeTfIdf).
     private static final Logger LOG = LoggerFactory.getLogger(ComputeTfIdf.class);
+
+    // Splits lines into words. Compiled once, as String.split would recompile the
+    // pattern for every line.
+    private static final Pattern WORD_SPLITTER = Pattern.compile("\\W+");
   }
 
   /**
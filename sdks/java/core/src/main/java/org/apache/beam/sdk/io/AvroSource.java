@@ -17,6 +17,7 @@
  */
 package org.apache.beam.sdk.io;
 
+import static com.google.common.base.Preconditions.checkNotNull;
 import static com.google.common.base.Preconditions.checkState;
 
 import org.apache.beam.sdk.annotations.Experimental;
@@ -28,6 +29,8 @@ import org.apache.beam.sdk.util.AvroUtils.AvroMetadata;
 import org.apache.beam.sdk.values.PCollection;
 
 import com.google.common.base.Preconditions;
+import com.google.common.io.ByteStreams;
+import com.google.common.primitives.Ints;
 
 import org.apache.avro.Schema;
 import org.apache.avro.file.CodecFactory;
@@ -40,24 +43,25 @@ import org.apache.avro.io.DecoderFactory;
 import org.apache.avro.reflect.ReflectData;
 import org.apache.avro.reflect.ReflectDatumReader;
 import org.apache.commons.compress.compressors.bzip2.BZip2CompressorInputStream;
-import org.apache.commons.compress.compressors.snappy.SnappyCompressorInputStream;
 import org.apache.commons.compress.compressors.xz.XZCompressorInputStream;
 import org.apache.commons.compress.utils.CountingInputStream;
+import org.xerial.snappy.Snappy;
 
 import java.io.ByteArrayInputStream;
 import java.io.EOFException;
 import java.io.IOException;
 import java.io.InputStream;
 import java.io.PushbackInputStream;
-import java.nio.ByteBuffer;
 import java.nio.channels.Channels;
 import java.nio.channels.ReadableByteChannel;
 import java.nio.channels.SeekableByteChannel;
 import java.util.Arrays;
 import java.util.Collection;
+import java.util.zip.CRC32;
 import java.util.zip.Inflater;
 import java.util.zip.InflaterInputStream;
 
+import javax.annotation.Nullable;
 import javax.annotation.concurrent.GuardedBy;
 
 // CHECKSTYLE.OFF: JavadocStyle
@@ -377,8 +381,9 @@ public class AvroSource<T> extends BlockBasedSource<T> {
     private final BinaryDecoder decoder;
 
     /**
-     * Decodes a byte array as an InputStream. The byte array may be compressed using some
-     * codec. Reads from the returned stream will result in decompressed bytes.
+     * Decodes the first {@code length} bytes of a byte array as an InputStream. The bytes may be
+     * compressed using some codec. Reads from the returned stream will result in decompressed
+     * bytes.
      *
      * <p>This supports the same codecs as Avro's {@link CodecFactory}, namely those defined in
      * {@link DataFileConstants}.
@@ -390,15 +395,36 @@ public class AvroSource<T> extends BlockBasedSource<T> {
      * <li>"xz" : xz compression
      * <li>"null" (the string, not the value): Uncompressed data
      * </ul>
+     *
+     * <p>Deflate-encoded data is decompressed using the given {@link Inflater}, which is reset
+     * before use so that a single instance can be shared by all blocks of a file.
      */
-    private static InputStream decodeAsInputStream(byte[] data, String codec) throws IOException {
-      ByteArrayInputStream byteStream = new ByteArrayInputStream(data);
+    private static InputStream decodeAsInputStream(
+        byte[] data, int length, String codec, @Nullable Inflater inflater) throws IOException {
+      ByteArrayInputStream byteStream = new ByteArrayInputStream(data, 0, length);
       switch (codec) {
         case DataFileConstants.SNAPPY_CODEC:
-          return new SnappyCompressorInputStream(byteStream);
+          // Avro follows the compressed data with a big-endian CRC32 of the uncompressed data,
+          // which is not part of the Snappy-encoded bytes.
+          if (length < 4) {
+            throw new IOException(String.format(
+                "Snappy-encoded block of %d bytes is too short to hold its checksum", length));
+          }
+          int compressedLength = length - 4;
+          byte[] uncompressed = new byte[Snappy.uncompressedLength(data, 0, compressedLength)];
+          int uncompressedLength = Snappy.uncompress(data, 0, compressedLength, uncompressed, 0);
+          CRC32 crc32 = new CRC32();
+          crc32.update(uncompressed, 0, uncompressedLength);
+          int expectedCrc = Ints.fromBytes(
+              data[compressedLength], data[compressedLength + 1],
+              data[compressedLength + 2], data[compressedLength + 3]);
+          if (expectedCrc != (int) crc32.getValue()) {
+            throw new IOException("Checksum failure");
+          }
+          return new ByteArrayInputStream(uncompressed, 0, uncompressedLength);
         case DataFileConstants.DEFLATE_CODEC:
-          // nowrap == true: Do not expect ZLIB header or checksum, as Avro does not write them.
-          Inflater inflater = new Inflater(true);
+          checkNotNull(inflater, "No Inflater provided for deflate-encoded data");
+          inflater.reset();
           return new InflaterInputStream(byteStream, inflater);
         case DataFileConstants.XZ_CODEC:
           return new XZCompressorInputStream(byteStream);
@@ -411,11 +437,18 @@ public class AvroSource<T> extends BlockBasedSource<T> {
       }
     }
 
-    AvroBlock(byte[] data, long numRecords, AvroSource<T> source) throws IOException {
+    AvroBlock(byte[] data, int length, long numRecords, DatumReader<T> reader, String codec,
+        @Nullable Inflater inflater) throws IOException {
       this.numRecords = numRecords;
-      this.reader = source.createDatumReader();
-      this.decoder =
-          DecoderFactory.get().binaryDecoder(decodeAsInputStream(data, source.getCodec()), null);
+      this.reader = reader;
+      if (DataFileConstants.NULL_CODEC.equals(codec)) {
+        // Uncompressed blocks are decoded directly from the array, rather than being copied
+        // through an InputStream into the decoder's own buffer.
+        this.decoder = DecoderFactory.get().binaryDecoder(data, 0, length, null);
+      } else {
+        this.decoder = DecoderFactory.get().binaryDecoder(
+            decodeAsInputStream(data, length, codec, inflater), null);
+      }
     }
 
     @Override
@@ -451,6 +484,10 @@ public class AvroSource<T> extends BlockBasedSource<T> {
    */
   @Experimental(Experimental.Kind.SOURCE_SINK)
   public static class AvroReader<T> extends BlockBasedReader<T> {
+    // Number of bytes read at a time while scanning for a sync marker. Bytes read past the marker
+    // are pushed back onto the stream, so the stream's pushback buffer is sized to match.
+    static final int SYNC_MARKER_SCAN_BUFFER_SIZE = 64 * 1024;
+
     // The current block.
     private AvroBlock<T> currentBlock;
 
@@ -475,6 +512,24 @@ public class AvroSource<T> extends BlockBasedSource<T> {
     // Caches the Avro DirectBinaryDecoder used to decode binary-encoded values from the buffer.
     private BinaryDecoder decoder;
 
+    // The DatumReader shared by all blocks read by this reader, created once when reading starts
+    // rather than once per block.
+    private DatumReader<T> datumReader;
+
+    // Decompresses deflate-encoded blocks. A single Inflater is reset and reused for every block
+    // instead of allocating a native zlib stream per block and leaving it to the finalizer to
+    // release. Null unless the file uses the deflate codec.
+    @Nullable
+    private Inflater inflater;
+
+    // Holds the bytes of the current block. Reused across blocks and only grown when a block
+    // is larger than any seen so far. Decoded records never refer to this buffer, as Avro copies
+    // bytes, strings and fixed values out of the data it decodes.
+    private byte[] blockBuffer = new byte[0];
+
+    // Holds the sync marker read after each block, allocated once when reading starts.
+    private byte[] readSyncMarker;
+
     /**
      * Reads Avro records of type {@code T} from the specified source.
      */
@@ -517,16 +572,19 @@ public class AvroSource<T> extends BlockBasedSource<T> {
 
       // Create the current block by reading blockSize bytes. Block sizes permitted by the Avro
       // specification are [32, 2^30], so this narrowing is ok.
-      byte[] data = new byte[(int) blockSize];
-      int read = stream.read(data);
+      int length = (int) blockSize;
+      if (blockBuffer.length < length) {
+        blockBuffer = new byte[length];
+      }
+      int read = ByteStreams.read(stream, blockBuffer, 0, length);
       checkState(blockSize == read, "Only %s/%s bytes in the block were read", read, blockSize);
-      currentBlock = new AvroBlock<>(data, numRecords, getCurrentSource());
+      currentBlock = new AvroBlock<>(
+          blockBuffer, length, numRecords, datumReader, getCurrentSource().getCodec(), inflater);
 
       // Read the end of this block, which MUST be a sync marker for correctness.
       byte[] syncMarker = getCurrentSource().getSyncMarker();
-      byte[] readSyncMarker = new byte[syncMarker.length];
       long syncMarkerOffset = startOfNextBlock + headerSize + blockSize;
-      long bytesRead = stream.read(readSyncMarker);
+      long bytesRead = ByteStreams.read(stream, readSyncMarker, 0, readSyncMarker.length);
       checkState(
           bytesRead == syncMarker.length,
           "When trying to read a sync marker at position %s, only able to read %s/%s bytes",
@@ -554,6 +612,18 @@ public class AvroSource<T> extends BlockBasedSource<T> {
       return true;
     }
 
+    @Override
+    public void close() throws IOException {
+      try {
+        super.close();
+      } finally {
+        if (inflater != null) {
+          inflater.end();
+          inflater = null;
+        }
+      }
+    }
+
     @Override
     public AvroBlock<T> getCurrentBlock() {
       return currentBlock;
@@ -593,8 +663,7 @@ public class AvroSource<T> extends BlockBasedSource<T> {
      */
     private PushbackInputStream createStream(ReadableByteChannel channel) {
       return new PushbackInputStream(
-          Channels.newInputStream(channel),
-          getCurrentSource().getSyncMarker().length);
+          Channels.newInputStream(channel), SYNC_MARKER_SCAN_BUFFER_SIZE);
     }
 
     // Postcondition: the stream is positioned at the beginning of the first block after the start
@@ -613,6 +682,13 @@ public class AvroSource<T> extends BlockBasedSource<T> {
         startOffset = position;
       }
 
+      datumReader = getCurrentSource().createDatumReader();
+      readSyncMarker = new byte[syncMarker.length];
+      if (DataFileConstants.DEFLATE_CODEC.equals(getCurrentSource().getCodec())) {
+        // nowrap == true: Do not expect ZLIB header or checksum, as Avro does not write them.
+        inflater = new Inflater(true);
+      }
+
       // Satisfy the post condition.
       stream = createStream(channel);
       countStream = new CountingInputStream(stream);
@@ -626,12 +702,12 @@ public class AvroSource<T> extends BlockBasedSource<T> {
      * Advances to the first byte after the next occurrence of the sync marker in the
      * stream when reading from the current offset. Returns the number of bytes consumed
      * from the stream. Note that this method requires a PushbackInputStream with a buffer
-     * at least as big as the marker it is seeking for.
+     * of at least {@link #SYNC_MARKER_SCAN_BUFFER_SIZE} bytes.
      */
     static long advancePastNextSyncMarker(PushbackInputStream stream, byte[] syncMarker)
         throws IOException {
       Seeker seeker = new Seeker(syncMarker);
-      byte[] syncBuffer = new byte[syncMarker.length];
+      byte[] syncBuffer = new byte[SYNC_MARKER_SCAN_BUFFER_SIZE];
       long totalBytesConsumed = 0;
       // Seek until either a sync marker is found or we reach the end of the file.
       int mark = -1; // Position of the last byte in the sync marker.
@@ -656,25 +732,37 @@ public class AvroSource<T> extends BlockBasedSource<T> {
     }
 
     /**
-     * A {@link Seeker} looks for a given marker within a byte buffer. Uses naive string matching
-     * with a sliding window, as sync markers are small and random.
+     * A {@link Seeker} looks for a given marker within a byte buffer. Uses Knuth-Morris-Pratt
+     * string matching, so each byte of the buffer is examined in amortized constant time and
+     * without any allocation.
      */
     static class Seeker {
       // The marker to search for.
-      private byte[] marker;
+      private final byte[] marker;
 
-      // Buffer used for the sliding window.
-      private byte[] searchBuffer;
+      // failure[i] is the length of the longest proper prefix of marker[0..i] that is also a
+      // suffix of it, i.e., how much of the marker is still matched after a mismatch at i + 1.
+      private final int[] failure;
 
-      // Number of bytes available to be matched in the buffer.
-      private int available = 0;
+      // Number of bytes of the marker matched by the most recently examined bytes.
+      private int matched = 0;
 
       /**
        * Create a {@link Seeker} that looks for the given marker.
        */
       public Seeker(byte[] marker) {
         this.marker = marker;
-        this.searchBuffer = new byte[marker.length];
+        this.failure = new int[marker.length];
+        int k = 0;
+        for (int i = 1; i < marker.length; i++) {
+          while (k > 0 && marker[i] != marker[k]) {
+            k = failure[k - 1];
+          }
+          if (marker[i] == marker[k]) {
+            k++;
+          }
+          failure[i] = k;
+        }
       }
 
       /**
@@ -690,12 +778,14 @@ public class AvroSource<T> extends BlockBasedSource<T> {
        */
       public int find(byte[] buffer, int length) {
         for (int i = 0; i < length; i++) {
-          System.arraycopy(searchBuffer, 1, searchBuffer, 0, searchBuffer.length - 1);
-          searchBuffer[searchBuffer.length - 1] = buffer[i];
-          available = Math.min(available + 1, searchBuffer.length);
-          if (ByteBuffer.wrap(searchBuffer, searchBuffer.length - available, available)
-                  .equals(ByteBuffer.wrap(marker))) {
-            available = 0;
+          while (matched > 0 && buffer[i] != marker[matched]) {
+            matched = failure[matched - 1];
+          }
+          if (buffer[i] == marker[matched]) {
+            matched++;
+          }
+          if (matched == marker.length) {
+            matched = 0;
             return i;
           }
         }
@@ -35,6 +35,7 @@ import java.io.PushbackInputStream;
 import java.io.Serializable;
 import java.nio.ByteBuffer;
 import java.nio.channels.Channels;
+import java.nio.channels.ClosedChannelException;
 import java.nio.channels.ReadableByteChannel;
 import java.util.NoSuchElementException;
 import java.util.zip.GZIPInputStream;
@@ -112,7 +113,7 @@ public class CompressedSource<T> extends FileBasedSource<T> {
     GZIP {
       @Override
       public boolean matches(String fileName) {
-          return fileName.toLowerCase().endsWith(".gz");
+          return hasExtension(fileName, ".gz");
       }
 
       @Override
@@ -130,10 +131,10 @@ public class CompressedSource<T> extends FileBasedSource<T> {
           byte zero = 0x00;
           int header = Ints.fromBytes(zero, zero, headerBytes[1], headerBytes[0]);
           if (header == GZIPInputStream.GZIP_MAGIC) {
-            return Channels.newChannel(new GzipCompressorInputStream(stream, true));
+            return new InputStreamChannel(new GzipCompressorInputStream(stream, true));
           }
         }
-        return Channels.newChannel(stream);
+        return new InputStreamChannel(stream);
       }
     },
 
@@ -143,13 +144,13 @@ public class CompressedSource<T> extends FileBasedSource<T> {
     BZIP2 {
       @Override
       public boolean matches(String fileName) {
-          return fileName.toLowerCase().endsWith(".bz2");
+          return hasExtension(fileName, ".bz2");
       }
 
       @Override
       public ReadableByteChannel createDecompressingChannel(ReadableByteChannel channel)
           throws IOException {
-        return Channels.newChannel(
+        return new InputStreamChannel(
             new BZip2CompressorInputStream(Channels.newInputStream(channel)));
       }
     },
@@ -161,13 +162,13 @@ public class CompressedSource<T> extends FileBasedSource<T> {
     ZIP {
       @Override
       public boolean matches(String fileName) {
-        return fileName.toLowerCase().endsWith(".zip");
+        return hasExtension(fileName, ".zip");
       }
 
       public ReadableByteChannel createDecompressingChannel(ReadableByteChannel channel)
         throws IOException {
         FullZipInputStream zip = new FullZipInputStream(Channels.newInputStream(channel));
-        return Channels.newChannel(zip);
+        return new InputStreamChannel(zip);
       }
     };
 
@@ -215,12 +216,69 @@ public class CompressedSource<T> extends FileBasedSource<T> {
 
     }
 
+    /**
+     * A {@link ReadableByteChannel} that reads from a decompressing {@link InputStream}.
+     *
+     * <p>{@link Channels#newChannel(InputStream)} decompresses into an intermediate array and then
+     * copies that into the destination buffer. For buffers backed by an array, this channel
+     * decompresses directly into the backing array instead.
+     */
+    private static class InputStreamChannel implements ReadableByteChannel {
+      private final InputStream inputStream;
+      private final ReadableByteChannel directBufferChannel;
+      private boolean open = true;
+
+      public InputStreamChannel(InputStream inputStream) {
+        this.inputStream = inputStream;
+        this.directBufferChannel = Channels.newChannel(inputStream);
+      }
+
+      @Override
+      public int read(ByteBuffer dst) throws IOException {
+        if (!open) {
+          throw new ClosedChannelException();
+        }
+        if (!dst.hasArray()) {
+          return directBufferChannel.read(dst);
+        }
+        if (!dst.hasRemaining()) {
+          return 0;
+        }
+        int bytesRead =
+            inputStream.read(dst.array(), dst.arrayOffset() + dst.position(), dst.remaining());
+        if (bytesRead > 0) {
+          dst.position(dst.position() + bytesRead);
+        }
+        return bytesRead;
+      }
+
+      @Override
+      public boolean isOpen() {
+        return open;
+      }
+
+      @Override
+      public void close() throws IOException {
+        open = false;
+        inputStream.close();
+      }
+    }
+
     /**
      * Returns {@code true} if the given file name implies that the contents are compressed
      * according to the compression embodied by this factory.
      */
     public abstract boolean matches(String fileName);
 
+    /**
+     * Returns {@code true} if the file name ends with the given lower case extension, ignoring
+     * case. Only the tail of the name is compared, so long paths are not copied to lower case.
+     */
+    private static boolean hasExtension(String fileName, String extension) {
+      int offset = fileName.length() - extension.length();
+      return offset >= 0 && fileName.regionMatches(true, offset, extension, 0, extension.length());
+    }
+
     @Override
     public abstract ReadableByteChannel createDecompressingChannel(ReadableByteChannel channel)
         throws IOException;
@@ -734,15 +734,17 @@ public class DatastoreIO {
       Sleeper sleeper = Sleeper.DEFAULT;
       BackOff backoff = new AttemptBoundedExponentialBackOff(MAX_RETRIES, INITIAL_BACKOFF_MILLIS);
 
+      // Batch upsert entities. The request is built once and resent unchanged on retries.
+      CommitRequest.Builder commitRequest = CommitRequest.newBuilder();
+      for (Entity entity: entities) {
+        commitRequest.addMutations(makeUpsert(entity));
+      }
+      commitRequest.setMode(CommitRequest.Mode.NON_TRANSACTIONAL);
+      CommitRequest request = commitRequest.build();
+
       while (true) {
-        // Batch upsert entities.
         try {
-          CommitRequest.Builder commitRequest = CommitRequest.newBuilder();
-          for (Entity entity: entities) {
-            commitRequest.addMutations(makeUpsert(entity));
-          }
-          commitRequest.setMode(CommitRequest.Mode.NON_TRANSACTIONAL);
-          datastore.commit(commitRequest.build());
+          datastore.commit(request);
           // Break if the commit threw no exception.
           break;
         } catch (DatastoreException exception) {
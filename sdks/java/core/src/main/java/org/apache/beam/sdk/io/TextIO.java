@@ -35,8 +35,8 @@ import org.apache.beam.sdk.values.PInput;
 
 import com.google.common.annotations.VisibleForTesting;
 import com.google.common.base.Preconditions;
-import com.google.protobuf.ByteString;
 
+import java.io.ByteArrayInputStream;
 import java.io.IOException;
 import java.io.OutputStream;
 import java.nio.ByteBuffer;
@@ -45,6 +45,7 @@ import java.nio.channels.ReadableByteChannel;
 import java.nio.channels.SeekableByteChannel;
 import java.nio.channels.WritableByteChannel;
 import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
 import java.util.NoSuchElementException;
 import java.util.regex.Pattern;
 
@@ -821,8 +822,12 @@ public class TextIO {
     static class TextBasedReader<T> extends FileBasedReader<T> {
       private static final int READ_BUFFER_SIZE = 8192;
       private final Coder<T> coder;
-      private final ByteBuffer readBuffer = ByteBuffer.allocate(READ_BUFFER_SIZE);
-      private ByteString buffer;
+      // Unconsumed bytes are buffer[bufferStart, bufferEnd). Positions "in buffer" below are
+      // relative to bufferStart, so consuming a record only advances bufferStart and leftover
+      // bytes stay in place until the buffer fills up.
+      private byte[] buffer = new byte[READ_BUFFER_SIZE];
+      private int bufferStart;
+      private int bufferEnd;
       private int startOfSeparatorInBuffer;
       private int endOfSeparatorInBuffer;
       private long startOfRecord;
@@ -835,7 +840,6 @@ public class TextIO {
       private TextBasedReader(TextSource<T> source) {
         super(source);
         coder = source.coder;
-        buffer = ByteString.EMPTY;
       }
 
       @Override
@@ -874,7 +878,7 @@ public class TextIO {
           long requiredPosition = getCurrentSource().getStartOffset() - 1;
           ((SeekableByteChannel) channel).position(requiredPosition);
           findSeparatorBounds();
-          buffer = buffer.substring(endOfSeparatorInBuffer);
+          bufferStart += endOfSeparatorInBuffer;
           startOfNextRecord = requiredPosition + endOfSeparatorInBuffer;
           endOfSeparatorInBuffer = 0;
           startOfSeparatorInBuffer = 0;
@@ -903,7 +907,19 @@ public class TextIO {
             break;
           }
 
-          byte currentByte = buffer.byteAt(bytePositionInBuffer);
+          // Scan everything already buffered before going back to the channel.
+          int bytesInBuffer = bufferEnd - bufferStart;
+          byte currentByte = 0;
+          while (bytePositionInBuffer < bytesInBuffer) {
+            currentByte = buffer[bufferStart + bytePositionInBuffer];
+            if (currentByte == '\n' || currentByte == '\r') {
+              break;
+            }
+            bytePositionInBuffer += 1;
+          }
+          if (bytePositionInBuffer == bytesInBuffer) {
+            continue;
+          }
 
           if (currentByte == '\n') {
             startOfSeparatorInBuffer = bytePositionInBuffer;
@@ -914,16 +930,13 @@ public class TextIO {
             endOfSeparatorInBuffer = startOfSeparatorInBuffer + 1;
 
             if (tryToEnsureNumberOfBytesInBuffer(bytePositionInBuffer + 2)) {
-              currentByte = buffer.byteAt(bytePositionInBuffer + 1);
+              currentByte = buffer[bufferStart + bytePositionInBuffer + 1];
               if (currentByte == '\n') {
                 endOfSeparatorInBuffer += 1;
               }
             }
             break;
           }
-
-          // Move to the next byte in buffer.
-          bytePositionInBuffer += 1;
         }
       }
 
@@ -934,7 +947,7 @@ public class TextIO {
 
         // If we have reached EOF file and consumed all of the buffer then we know
         // that there are no more records.
-        if (eof && buffer.size() == 0) {
+        if (eof && bufferEnd == bufferStart) {
           elementIsPresent = false;
           return false;
         }
@@ -951,10 +964,11 @@ public class TextIO {
        * {@code endOfSeparatorInBuffer}.
        */
       private void decodeCurrentElement() throws IOException {
-        ByteString dataToDecode = buffer.substring(0, startOfSeparatorInBuffer);
-        currentValue = coder.decode(dataToDecode.newInput(), Context.OUTER);
+        currentValue = coder.decode(
+            new ByteArrayInputStream(buffer, bufferStart, startOfSeparatorInBuffer),
+            Context.OUTER);
         elementIsPresent = true;
-        buffer = buffer.substring(endOfSeparatorInBuffer);
+        bufferStart += endOfSeparatorInBuffer;
       }
 
       /**
@@ -963,14 +977,36 @@ public class TextIO {
       private boolean tryToEnsureNumberOfBytesInBuffer(int minCapacity) throws IOException {
         // While we aren't at EOF or haven't fulfilled the minimum buffer capacity,
         // attempt to read more bytes.
-        while (buffer.size() <= minCapacity && !eof) {
-          eof = inChannel.read(readBuffer) == -1;
-          readBuffer.flip();
-          buffer = buffer.concat(ByteString.copyFrom(readBuffer));
-          readBuffer.clear();
+        while (bufferEnd - bufferStart <= minCapacity && !eof) {
+          if (bufferEnd == buffer.length) {
+            makeRoomInBuffer();
+          }
+          int bytesRead =
+              inChannel.read(ByteBuffer.wrap(buffer, bufferEnd, buffer.length - bufferEnd));
+          if (bytesRead == -1) {
+            eof = true;
+          } else {
+            bufferEnd += bytesRead;
+          }
         }
         // Return true if we were able to honor the minimum buffer capacity request
-        return buffer.size() >= minCapacity;
+        return bufferEnd - bufferStart >= minCapacity;
+      }
+
+      /**
+       * Frees space at the end of a full buffer. Unconsumed bytes are moved to the front when
+       * they fill at most half of the buffer; otherwise the buffer is doubled. Each byte is thus
+       * moved an amortized constant number of times, however long the records are.
+       */
+      private void makeRoomInBuffer() {
+        int size = bufferEnd - bufferStart;
+        if (size <= buffer.length / 2) {
+          System.arraycopy(buffer, bufferStart, buffer, 0, size);
+        } else {
+          buffer = Arrays.copyOfRange(buffer, bufferStart, bufferStart + buffer.length * 2);
+        }
+        bufferStart = 0;
+        bufferEnd = size;
       }
     }
   }
@@ -26,11 +26,9 @@ import com.google.api.client.googleapis.auth.oauth2.GoogleAuthorizationCodeFlow;
 import com.google.api.client.googleapis.auth.oauth2.GoogleClientSecrets;
 import com.google.api.client.googleapis.auth.oauth2.GoogleCredential;
 import com.google.api.client.googleapis.auth.oauth2.GoogleOAuthConstants;
-import com.google.api.client.googleapis.javanet.GoogleNetHttpTransport;
 import com.google.api.client.http.GenericUrl;
 import com.google.api.client.http.HttpTransport;
 import com.google.api.client.json.JsonFactory;
-import com.google.api.client.json.jackson2.JacksonFactory;
 import com.google.api.client.util.store.FileDataStoreFactory;
 import com.google.common.base.Preconditions;
 
@@ -120,7 +118,8 @@ public class Credentials {
     }
 
     try {
-      return GoogleCredential.getApplicationDefault().createScoped(SCOPES);
+      return GoogleCredential.getApplicationDefault(
+          Transport.getTransport(), Transport.getJsonFactory()).createScoped(SCOPES);
     } catch (IOException e) {
       throw new RuntimeException("Unable to get application default credentials. Please see "
           + "https://developers.google.com/accounts/docs/application-default-credentials "
@@ -154,13 +153,13 @@ public class Credentials {
    */
   private static Credential getCredentialFromClientSecrets(
       GcpOptions options, Collection<String> scopes)
-      throws IOException, GeneralSecurityException {
+      throws IOException {
     String clientSecretsFile = options.getSecretsFile();
 
     Preconditions.checkArgument(clientSecretsFile != null);
-    HttpTransport httpTransport = GoogleNetHttpTransport.newTrustedTransport();
+    HttpTransport httpTransport = Transport.getTransport();
 
-    JsonFactory jsonFactory = JacksonFactory.getDefaultInstance();
+    JsonFactory jsonFactory = Transport.getJsonFactory();
     GoogleClientSecrets clientSecrets;
 
     try {
@@ -23,8 +23,6 @@ import org.apache.beam.sdk.options.PipelineOptions;
 import java.io.FileNotFoundException;
 import java.io.IOException;
 import java.nio.channels.WritableByteChannel;
-import java.text.DecimalFormat;
-import java.util.Arrays;
 import java.util.Collections;
 import java.util.HashMap;
 import java.util.HashSet;
@@ -41,9 +39,6 @@ public class IOChannelUtils {
   private static final Map<String, IOChannelFactory> FACTORY_MAP =
       Collections.synchronizedMap(new HashMap<String, IOChannelFactory>());
 
-  // Pattern that matches shard placeholders within a shard template.
-  private static final Pattern SHARD_FORMAT_RE = Pattern.compile("(S+|N+)");
-
   /**
    * Associates a scheme with an {@link IOChannelFactory}.
    *
@@ -138,23 +133,29 @@ public class IOChannelUtils {
    */
   public static String constructName(String prefix,
       String shardTemplate, String suffix, int shardNum, int numShards) {
-    // Matcher API works with StringBuffer, rather than StringBuilder.
-    StringBuffer sb = new StringBuffer();
-    sb.append(prefix);
-
-    Matcher m = SHARD_FORMAT_RE.matcher(shardTemplate);
-    while (m.find()) {
-      boolean isShardNum = (m.group(1).charAt(0) == 'S');
-
-      char[] zeros = new char[m.end() - m.start()];
-      Arrays.fill(zeros, '0');
-      DecimalFormat df = new DecimalFormat(String.valueOf(zeros));
-      String formatted = df.format(isShardNum
-                                   ? shardNum
-                                   : numShards);
-      m.appendReplacement(sb, formatted);
+    // Called once per shard while finalizing large writes, so the template is scanned by hand
+    // and placeholders are zero-padded straight into the builder.
+    StringBuilder sb = new StringBuilder(prefix);
+
+    int i = 0;
+    while (i < shardTemplate.length()) {
+      char c = shardTemplate.charAt(i);
+      if (c != 'S' && c != 'N') {
+        sb.append(c);
+        i++;
+        continue;
+      }
+
+      int start = i;
+      while (i < shardTemplate.length() && shardTemplate.charAt(i) == c) {
+        i++;
+      }
+      String number = Integer.toString(c == 'S' ? shardNum : numShards);
+      for (int zeros = i - start - number.length(); zeros > 0; zeros--) {
+        sb.append('0');
+      }
+      sb.append(number);
     }
-    m.appendTail(sb);
 
     sb.append(suffix);
     return sb.toString();
@@ -59,6 +59,9 @@ import java.io.File;
 import java.io.FileOutputStream;
 import java.io.IOException;
 import java.io.PushbackInputStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
 import java.util.ArrayList;
 import java.util.Collections;
 import java.util.List;
@@ -147,6 +150,96 @@ public class AvroSourceTest {
     }
   }
 
+  @Test
+  public void testReadMultipleBlocksWithDifferentCodecs() throws Exception {
+    // Ten records per block, so every codec is decoded across many blocks. The deflate Inflater
+    // and the block buffer are reused between blocks.
+    String codecs[] = {DataFileConstants.NULL_CODEC, DataFileConstants.BZIP2_CODEC,
+        DataFileConstants.DEFLATE_CODEC, DataFileConstants.SNAPPY_CODEC,
+        DataFileConstants.XZ_CODEC};
+    List<Bird> expected = createRandomRecords(100);
+
+    for (String codec : codecs) {
+      String filename = generateTestFile(
+          codec, expected, SyncBehavior.SYNC_REGULAR, 10, AvroCoder.of(Bird.class), codec);
+      AvroSource<Bird> source = AvroSource.from(filename).withSchema(Bird.class);
+
+      List<Bird> actual = new ArrayList<>();
+      BoundedReader<Bird> reader = source.createReader(null);
+      for (boolean more = reader.start(); more; more = reader.advance()) {
+        actual.add(reader.getCurrent());
+      }
+      // Closing releases the Inflater; closing again must be harmless.
+      reader.close();
+      reader.close();
+      assertThat(expected, containsInAnyOrder(actual.toArray()));
+
+      SourceTestUtils.assertSplitAtFractionExhaustive(source, null);
+    }
+  }
+
+  @Test
+  public void testReadBlocksOfDifferentSizesWithDifferentCodecs() throws Exception {
+    // Long blocks are followed by much shorter ones, so each block is decoded from a reused
+    // buffer that still holds the tail of a longer block.
+    String codecs[] = {DataFileConstants.NULL_CODEC, DataFileConstants.BZIP2_CODEC,
+        DataFileConstants.DEFLATE_CODEC, DataFileConstants.SNAPPY_CODEC,
+        DataFileConstants.XZ_CODEC};
+    int[] blockSizes = {40, 1, 25, 3, 10, 1, 20};
+    List<Bird> expected = createRandomRecords(100);
+    AvroCoder<Bird> coder = AvroCoder.of(Bird.class);
+
+    for (String codec : codecs) {
+      File file = tmpFolder.newFile(codec);
+      try (DataFileWriter<Bird> writer = new DataFileWriter<>(coder.createDatumWriter())) {
+        writer.setCodec(CodecFactory.fromString(codec));
+        writer.create(coder.getSchema(), file);
+        int recordIndex = 0;
+        for (int blockSize : blockSizes) {
+          for (int i = 0; i < blockSize; i++) {
+            writer.append(expected.get(recordIndex++));
+          }
+          writer.sync();
+        }
+      }
+
+      AvroSource<Bird> source = AvroSource.from(file.toString()).withSchema(Bird.class);
+      List<Bird> actual = SourceTestUtils.readFromSource(source, null);
+      assertThat(expected, containsInAnyOrder(actual.toArray()));
+    }
+  }
+
+  @Test
+  public void testReadSnappyFileWithManyBlocks() throws Exception {
+    // Seven records per block, so each checksum is verified over a prefix of the reused block
+    // buffer.
+    List<Bird> expected = createRandomRecords(DEFAULT_RECORD_COUNT);
+    String filename = generateTestFile("tmp.avro", expected, SyncBehavior.SYNC_REGULAR, 7,
+        AvroCoder.of(Bird.class), DataFileConstants.SNAPPY_CODEC);
+    AvroSource<Bird> source = AvroSource.from(filename).withSchema(Bird.class);
+    List<Bird> actual = SourceTestUtils.readFromSource(source, null);
+    assertThat(expected, containsInAnyOrder(actual.toArray()));
+  }
+
+  @Test
+  public void testReadSnappyBlockWithCorruptChecksum() throws Exception {
+    List<Bird> expected = createRandomRecords(10);
+    String filename = generateTestFile("tmp.avro", expected, SyncBehavior.SYNC_DEFAULT, 0,
+        AvroCoder.of(Bird.class), DataFileConstants.SNAPPY_CODEC);
+
+    // The file holds a single block, which ends with its 4-byte CRC32 followed by the 16-byte
+    // sync marker that ends the file.
+    Path path = Paths.get(filename);
+    byte[] contents = Files.readAllBytes(path);
+    contents[contents.length - 17] ^= 0xFF;
+    Files.write(path, contents);
+
+    AvroSource<Bird> source = AvroSource.from(filename).withSchema(Bird.class);
+    expectedException.expect(IOException.class);
+    expectedException.expectMessage("Checksum failure");
+    SourceTestUtils.readFromSource(source, null);
+  }
+
   @Test
   public void testSplitAtFraction() throws Exception {
     // A reduced dataset is enough here.
@@ -452,8 +545,8 @@ public class AvroSourceTest {
     byte sentinel = (byte) 0xFF;
     byte[] marker = new byte[] {1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 1, 2, 3, 4, 5, 6};
     byte[] haystack = createHaystack(marker, position, size);
-    PushbackInputStream stream =
-        new PushbackInputStream(new ByteArrayInputStream(haystack), marker.length);
+    PushbackInputStream stream = new PushbackInputStream(
+        new ByteArrayInputStream(haystack), AvroReader.SYNC_MARKER_SCAN_BUFFER_SIZE);
     if (position + marker.length < size) {
       haystack[position + marker.length] = sentinel;
       assertEquals(position + marker.length, AvroReader.advancePastNextSyncMarker(stream, marker));
@@ -482,6 +575,25 @@ public class AvroSourceTest {
     testAdvancePastNextSyncMarkerAt(1000, 1000);
   }
 
+  @Test
+  public void testAdvancePastNextSyncMarkerAcrossReads() throws IOException {
+    // Haystacks larger than the scan buffer, so the marker is looked for over several reads and
+    // the tail of a later read is unread.
+    int bufferSize = AvroReader.SYNC_MARKER_SCAN_BUFFER_SIZE;
+    int size = 2 * bufferSize + 1000;
+    // Test placing the sync marker so that it straddles the end of the first read.
+    testAdvancePastNextSyncMarkerAt(bufferSize - 8, size);
+    testAdvancePastNextSyncMarkerAt(bufferSize - 1, size);
+    // Test placing the sync marker so that it ends exactly at the end of the first read.
+    testAdvancePastNextSyncMarkerAt(bufferSize - 16, size);
+    // Test placing the sync marker inside later reads.
+    testAdvancePastNextSyncMarkerAt(bufferSize, size);
+    testAdvancePastNextSyncMarkerAt(bufferSize + 160, size);
+    testAdvancePastNextSyncMarkerAt(2 * bufferSize + 100, size);
+    // Test with no sync marker.
+    testAdvancePastNextSyncMarkerAt(size, size);
+  }
+
   // Tests for Seeker.
   @Test
   public void testSeekerFind() {
@@ -580,6 +692,22 @@ public class AvroSourceTest {
     assertEquals(0, s.find(buffer, buffer.length));
   }
 
+  @Test
+  public void testSeekerFindSelfOverlappingMarker() {
+    byte[] marker = {1, 2, 1, 2, 3};
+    byte[] buffer;
+    Seeker s;
+    s = new Seeker(marker);
+
+    buffer = new byte[] {1, 2, 1, 2, 1, 2, 3, 0};
+    assertEquals(6, s.find(buffer, buffer.length));
+
+    buffer = new byte[] {1, 2, 1};
+    assertEquals(-1, s.find(buffer, buffer.length));
+    buffer = new byte[] {2, 1, 2, 3};
+    assertEquals(3, s.find(buffer, buffer.length));
+  }
+
   @Test
   public void testSeekerFindAllLocations() {
     byte[] marker = {1, 1, 2};
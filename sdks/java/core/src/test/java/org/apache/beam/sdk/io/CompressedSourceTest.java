@@ -22,6 +22,7 @@ import static org.apache.beam.sdk.transforms.display.DisplayDataMatchers.include
 import static org.hamcrest.Matchers.containsString;
 import static org.hamcrest.Matchers.instanceOf;
 import static org.hamcrest.Matchers.not;
+import static org.junit.Assert.assertArrayEquals;
 import static org.junit.Assert.assertEquals;
 import static org.junit.Assert.assertFalse;
 import static org.junit.Assert.assertNotNull;
@@ -63,15 +64,19 @@ import org.junit.rules.TemporaryFolder;
 import org.junit.runner.RunWith;
 import org.junit.runners.JUnit4;
 
+import java.io.ByteArrayInputStream;
 import java.io.ByteArrayOutputStream;
 import java.io.File;
 import java.io.FileOutputStream;
 import java.io.IOException;
 import java.io.OutputStream;
 import java.nio.ByteBuffer;
+import java.nio.channels.Channels;
+import java.nio.channels.ClosedChannelException;
 import java.nio.channels.ReadableByteChannel;
 import java.nio.charset.StandardCharsets;
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.List;
 import java.util.NoSuchElementException;
 import java.util.Random;
@@ -431,6 +436,87 @@ public class CompressedSourceTest {
     assertThat(compressedSourceDisplayData, includesDisplayDataFrom(inputSource));
   }
 
+  /**
+   * Test that a decompressing channel fills a direct buffer, which has no backing array.
+   */
+  @Test
+  public void testDecompressingChannelReadsIntoDirectBuffer() throws Exception {
+    byte[] input = generateInput(5000);
+    ReadableByteChannel channel = createGzipDecompressingChannel(input);
+    ByteBuffer buffer = ByteBuffer.allocateDirect(input.length + 1);
+    readUntilFullOrEof(channel, buffer);
+
+    buffer.flip();
+    byte[] actual = new byte[buffer.remaining()];
+    buffer.get(actual);
+    assertArrayEquals(input, actual);
+  }
+
+  /**
+   * Test that reading into a buffer with no space remaining returns 0 and consumes nothing.
+   */
+  @Test
+  public void testDecompressingChannelReadIntoFullBuffer() throws Exception {
+    byte[] input = generateInput(10);
+    ReadableByteChannel channel = createGzipDecompressingChannel(input);
+    assertEquals(0, channel.read(ByteBuffer.allocate(0)));
+    ByteBuffer full = ByteBuffer.allocate(4);
+    full.position(4);
+    assertEquals(0, channel.read(full));
+
+    ByteBuffer buffer = ByteBuffer.allocate(input.length);
+    readUntilFullOrEof(channel, buffer);
+    assertArrayEquals(input, buffer.array());
+  }
+
+  /**
+   * Test that reading from a closed decompressing channel fails.
+   */
+  @Test
+  public void testDecompressingChannelReadAfterClose() throws Exception {
+    ReadableByteChannel channel = createGzipDecompressingChannel(generateInput(10));
+    assertTrue(channel.isOpen());
+    channel.close();
+    assertFalse(channel.isOpen());
+
+    thrown.expect(ClosedChannelException.class);
+    channel.read(ByteBuffer.allocate(10));
+  }
+
+  /**
+   * Test that a decompressing channel writes at the position of a buffer that wraps part of an
+   * array, leaving the rest of the array untouched.
+   */
+  @Test
+  public void testDecompressingChannelReadsAtBufferPosition() throws Exception {
+    byte[] input = generateInput(100);
+    ReadableByteChannel channel = createGzipDecompressingChannel(input);
+    byte[] array = new byte[110];
+    ByteBuffer buffer = ByteBuffer.wrap(array, 3, input.length);
+    readUntilFullOrEof(channel, buffer);
+
+    assertEquals(3 + input.length, buffer.position());
+    assertArrayEquals(input, Arrays.copyOfRange(array, 3, 3 + input.length));
+    assertArrayEquals(new byte[3], Arrays.copyOfRange(array, 0, 3));
+    assertArrayEquals(new byte[7], Arrays.copyOfRange(array, 3 + input.length, array.length));
+    assertEquals(-1, channel.read(ByteBuffer.allocate(10)));
+  }
+
+  private static ReadableByteChannel createGzipDecompressingChannel(byte[] input)
+      throws IOException {
+    return CompressionMode.GZIP.createDecompressingChannel(
+        Channels.newChannel(new ByteArrayInputStream(compressGzip(input))));
+  }
+
+  private static void readUntilFullOrEof(ReadableByteChannel channel, ByteBuffer buffer)
+      throws IOException {
+    while (buffer.hasRemaining()) {
+      if (channel.read(buffer) == -1) {
+        return;
+      }
+    }
+  }
+
   /**
    * Generate byte array of given size.
    */
@@ -53,6 +53,7 @@ import org.apache.beam.sdk.util.gcsfs.GcsPath;
 import org.apache.beam.sdk.values.PCollection;
 import org.apache.beam.sdk.values.PDone;
 
+import com.google.common.base.Strings;
 import com.google.common.collect.ImmutableList;
 
 import org.junit.Rule;
@@ -794,6 +795,76 @@ public class TextIOTest {
         ImmutableList.of("asdf", "hjkl", "xyz"));
   }
 
+  @Test
+  public void testReadLineLongerThanReadBuffer() throws Exception {
+    // Several times the reader's 8KB read buffer, so the buffer has to grow to hold the line.
+    String longLine = Strings.repeat("a", 3 * 8192 + 100);
+    byte[] data = (longLine + "\nxyz\n").getBytes(StandardCharsets.UTF_8);
+    runTestReadWithData(data, ImmutableList.of(longLine, "xyz"));
+    SourceTestUtils.assertSplitAtFractionExhaustive(
+        prepareSource(data), PipelineOptionsFactory.create());
+  }
+
+  @Test
+  public void testReadShortLinesLongerThanReadBuffer() throws Exception {
+    // Short lines filling the 8KB read buffer several times over, so consumed bytes are
+    // compacted away and lines regularly span a refill.
+    List<String> expected = new ArrayList<>();
+    StringBuilder data = new StringBuilder();
+    for (int i = 0; i < 5000; i++) {
+      String line = "line" + i;
+      expected.add(line);
+      data.append(line).append('\n');
+    }
+    runTestReadWithData(data.toString().getBytes(StandardCharsets.UTF_8), expected);
+  }
+
+  @Test
+  public void testReadFromNonZeroOffsetWithLinesLongerThanReadBuffer() throws Exception {
+    // Starting inside the first line, the reader skips past it across a refill and then reads
+    // a second line that also spans one.
+    String first = Strings.repeat("a", 10000);
+    String second = Strings.repeat("b", 10000);
+    byte[] data = (first + "\n" + second + "\nxyz\n").getBytes(StandardCharsets.UTF_8);
+    TextSource<String> source = prepareSource(data);
+    String fileName = source.getFileOrPatternSpec();
+
+    FileBasedSource<String> head = source.createForSubrangeOfFile(fileName, 0, 100);
+    FileBasedSource<String> tail = source.createForSubrangeOfFile(fileName, 100, data.length);
+    assertEquals(ImmutableList.of(first),
+        SourceTestUtils.readFromSource(head, PipelineOptionsFactory.create()));
+    assertEquals(ImmutableList.of(second, "xyz"),
+        SourceTestUtils.readFromSource(tail, PipelineOptionsFactory.create()));
+  }
+
+  @Test
+  public void testReadCarriageReturnLineFeedSplitAcrossReadsInGrownBuffer() throws Exception {
+    // The '\r' is the last byte of the first 8KB read and the '\n' the first byte of the next.
+    // The line fills the whole buffer, so it has to grow before the '\n' can be read.
+    String line = Strings.repeat("x", 8191);
+    byte[] data = (line + "\r\nxyz\n").getBytes(StandardCharsets.UTF_8);
+    runTestReadWithData(data, ImmutableList.of(line, "xyz"));
+    SourceTestUtils.assertSplitAtFractionExhaustive(
+        prepareSource(data), PipelineOptionsFactory.create());
+  }
+
+  @Test
+  public void testReadCarriageReturnLineFeedSplitAcrossReadsInCompactedBuffer() throws Exception {
+    // As above, but the '\r' ends a short line, so the buffer is compacted before the '\n' is
+    // read.
+    List<String> expected = new ArrayList<>();
+    StringBuilder data = new StringBuilder();
+    for (int i = 0; i < 1023; i++) {
+      expected.add("abcdefg");
+      data.append("abcdefg\n");
+    }
+    expected.add("abcdefg");
+    data.append("abcdefg\r\n");
+    expected.add("xyz");
+    data.append("xyz\n");
+    runTestReadWithData(data.toString().getBytes(StandardCharsets.UTF_8), expected);
+  }
+
   private void runTestReadWithData(byte[] data, List<String> expectedResults) throws Exception {
     TextSource<String> source = prepareSource(data);
     List<String> actual = SourceTestUtils.readFromSource(source, PipelineOptionsFactory.create());
@@ -140,14 +140,14 @@ public class DebuggingWordCount {
         // Log at the "DEBUG" level each element that we match. When executing this pipeline
         // using the Dataflow service, these log lines will appear in the Cloud Logging UI
         // only if the log level is set to "DEBUG" or lower.
-        LOG.debug("Matched: " + c.element().getKey());
+        LOG.debug("Matched: {}", c.element().getKey());
         matchedWords.addValue(1L);
         c.output(c.element());
       } else {
         // Log at the "TRACE" level each element that is not matched. Different log levels
         // can be used to control the verbosity of logging providing an effective mechanism
         // to filter less important information.
-        LOG.trace("Did not match: " + c.element().getKey());
+        LOG.trace("Did not match: {}", c.element().getKey());
         unmatchedWords.addValue(1L);
       }
     }
@@ -35,6 +35,7 @@ import org.apache.beam.sdk.util.gcsfs.GcsPath;
 import org.apache.beam.sdk.values.KV;
 import org.apache.beam.sdk.values.PCollection;
 
+import java.util.regex.Pattern;
 
 /**
  * An example that counts words in Shakespeare and includes Dataflow best practices.
@@ -96,6 +97,9 @@ public class WordCount {
    * pipeline.
    */
   static class ExtractWordsFn extends DoFn<String, String> {
+    // Compiled once, as String.split would recompile the pattern for every line.
+    private static final Pattern WORD_SPLITTER = Pattern.compile("[^a-zA-Z']+");
+
     private final Aggregator<Long, Long> emptyLines =
         createAggregator("emptyLines", new Sum.SumLongFn());
 
@@ -106,7 +110,7 @@ public class WordCount {
       }
 
       // Split the line into words.
-      String[] words = c.element().split("[^a-zA-Z']+");
+      String[] words = WORD_SPLITTER.split(c.element());
 
       // Output each word encountered into the output PCollection.
       for (String word : words) {